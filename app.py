@@ -14,9 +14,10 @@ print("ENV OPENAI:", "FOUND" if os.getenv("OPENAI_API_KEY") else "MISSING")
 
 # Import modules
 from parser.vcf_parser import parse_vcf
-from engine.phenotype_rules import infer_phenotype
+from engine.phenotype_rules import infer_phenotype, profile_to_dict
 from engine.drug_rules import assess_drug_risk
 from llm.explain import generate_explanation
+from engine.admission import AdmissionController, AdmissionRejected, estimate_request_cost, count_vcf_samples
 
 app = Flask(__name__)
 
@@ -30,6 +31,10 @@ app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB Limit
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-pharmaguard') # Required for flash
 
+# Admission control (budget / queue timeout / Retry-After via ADMISSION_* env vars)
+# Per-process state: the budget assumes the Procfile's single threaded gunicorn worker.
+admission = AdmissionController()
+
 # Ensure directories exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
@@ -60,13 +65,27 @@ def analyze():
         return redirect(url_for('index'))
         
     if file and allowed_file(file.filename):
+        # Admission Control: estimate cost before doing any work
+        file.stream.seek(0, os.SEEK_END)
+        upload_bytes = file.stream.tell()
+        file.stream.seek(0)
+        drug_list = [d.strip() for d in drug_input.split(',') if d.strip()]
+        request_cost = estimate_request_cost(upload_bytes, count_vcf_samples(file.stream), drug_list)
+
+        try:
+            admission.acquire(request_cost)
+        except AdmissionRejected as e:
+            flash(str(e), 'warning')
+            return render_template('index.html'), 503, {'Retry-After': str(e.retry_after)}
+
         # Save file
         filename = secure_filename(file.filename)
         unique_filename = f"{uuid.uuid4()}_{filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(filepath)
         
         try:
+            file.save(filepath)
+            
             # 2. Pipeline Execution
             
             # Step A: VCF Parsing (Run once)
@@ -78,8 +97,6 @@ def analyze():
                 flash(f"Error parsing VCF file: {str(e)}", 'danger')
                 return redirect(url_for('index'))
             
-            # Parse multiple drugs
-            drug_list = [d.strip() for d in drug_input.split(',') if d.strip()]
             results = []
             
             patient_id = str(uuid.uuid4())[:8]
@@ -116,7 +133,7 @@ def analyze():
                         "confidence_score": risk_assessment.get('confidence_score', 0.0),
                         "severity": risk_assessment.get('severity', 'Unknown').lower()
                     },
-                    "pharmacogenomic_profile": phenotype_profile,
+                    "pharmacogenomic_profile": profile_to_dict(phenotype_profile),
                     "clinical_recommendation": {
                         "recommendation": explanation.get('clinical_recommendation', 'Consult a physician.'),
                         "guideline_basis": explanation.get('guideline_basis', 'N/A')
@@ -154,6 +171,7 @@ def analyze():
             flash(f"An unexpected error occurred: {str(e)}", 'danger')
             return redirect(url_for('index'))
         finally:
+            admission.release(request_cost)
             # Cleanup upload
             if os.path.exists(filepath):
                 os.remove(filepath)
@@ -173,6 +191,12 @@ def env_test():
         "openai": bool(os.getenv("OPENAI_API_KEY"))
     }
 
+@app.route("/metrics")
+def metrics():
+    return {
+        "admission": admission.snapshot()
+    }
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
@@ -0,0 +1,140 @@
+import collections
+import os
+import threading
+import time
+
+# Cost weights (abstract "work units")
+BASE_REQUEST_COST = 1.0
+COST_PER_MB = 2.0           # Upload size: parsing is linear in bytes
+COST_PER_SAMPLE = 0.5       # Extra sample columns widen every variant line
+COST_PER_LLM_DRUG = 5.0     # Uncached LLM explanation (network round-trip, dominant cost)
+COST_PER_CACHED_DRUG = 0.5  # Rule lookup only
+
+# Defaults (overridable through environment)
+DEFAULT_COST_BUDGET = 40.0
+DEFAULT_QUEUE_TIMEOUT = 5.0
+DEFAULT_RETRY_AFTER = 10
+
+
+def count_vcf_samples(stream):
+    """
+    Counts sample columns from the #CHROM header line of a VCF stream.
+    Restores the stream position afterwards. Returns 1 if no header is found.
+    """
+    position = stream.tell()
+    samples = 1
+    try:
+        for raw_line in stream:
+            line = raw_line.decode('utf-8', errors='ignore') if isinstance(raw_line, bytes) else raw_line
+            if line.startswith('#CHROM'):
+                # CHROM POS ID REF ALT QUAL FILTER INFO FORMAT SAMPLE...
+                samples = max(len(line.split()) - 9, 1)
+                break
+            if not line.startswith('#'):
+                break
+    finally:
+        stream.seek(position)
+    return samples
+
+
+def estimate_request_cost(upload_bytes, sample_count, drug_list, is_cached=None):
+    """
+    Estimates the cost of an /analyze request from upload size, sample count
+    and the number of drugs that will need an uncached LLM explanation.
+    `is_cached` is an optional predicate telling whether a drug's explanation is already cached.
+    """
+    cost = BASE_REQUEST_COST
+    cost += COST_PER_MB * (upload_bytes / (1024 * 1024))
+    cost += COST_PER_SAMPLE * max(sample_count - 1, 0)
+
+    for drug_name in drug_list:
+        if is_cached and is_cached(drug_name):
+            cost += COST_PER_CACHED_DRUG
+        else:
+            cost += COST_PER_LLM_DRUG
+
+    return round(cost, 2)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted within the queue timeout."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Server is busy. Retry after {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Keeps the total estimated cost of in-flight requests below a budget.
+    Waiting requests are admitted in arrival order (FIFO), so newer small requests
+    cannot overtake a queued large one. A request larger than the whole budget is
+    admitted once nothing else is running. Requests still waiting after
+    `queue_timeout` seconds are rejected.
+
+    State is per process: the budget assumes the Procfile's single gunicorn
+    worker with threads (gthread), so it covers the whole server. With more
+    workers, each one enforces its own budget.
+    """
+
+    def __init__(self, budget=None, queue_timeout=None, retry_after=None):
+        self.budget = float(budget if budget is not None else os.environ.get('ADMISSION_COST_BUDGET', DEFAULT_COST_BUDGET))
+        self.queue_timeout = float(queue_timeout if queue_timeout is not None else os.environ.get('ADMISSION_QUEUE_TIMEOUT', DEFAULT_QUEUE_TIMEOUT))
+        self.retry_after = int(retry_after if retry_after is not None else os.environ.get('ADMISSION_RETRY_AFTER', DEFAULT_RETRY_AFTER))
+
+        self._cond = threading.Condition()
+        self._queue = collections.deque()  # Tickets of waiting requests, oldest first
+        self._next_ticket = 0
+        self._in_flight_cost = 0.0
+        self._in_flight_requests = 0
+        self._admitted_total = 0
+        self._rejected_total = 0
+
+    def _fits(self, cost):
+        return self._in_flight_requests == 0 or self._in_flight_cost + cost <= self.budget
+
+    def acquire(self, cost):
+        """
+        Admits a request of the given cost, waiting in the queue if needed.
+        Raises AdmissionRejected if it does not fit before the timeout.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._queue.append(ticket)
+            try:
+                while self._queue[0] != ticket or not self._fits(cost):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_total += 1
+                        raise AdmissionRejected(self.retry_after)
+                    self._cond.wait(remaining)
+            finally:
+                self._queue.remove(ticket)
+                # Head of the queue may have changed
+                self._cond.notify_all()
+
+            self._in_flight_cost += cost
+            self._in_flight_requests += 1
+            self._admitted_total += 1
+
+    def release(self, cost):
+        with self._cond:
+            self._in_flight_cost = max(self._in_flight_cost - cost, 0.0)
+            self._in_flight_requests = max(self._in_flight_requests - 1, 0)
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """Returns current load for the metrics endpoint."""
+        with self._cond:
+            return {
+                "worker_pid": os.getpid(),
+                "cost_budget": self.budget,
+                "in_flight_cost": round(self._in_flight_cost, 2),
+                "in_flight_requests": self._in_flight_requests,
+                "queued_requests": len(self._queue),
+                "utilization": round(self._in_flight_cost / self.budget, 3) if self.budget else 0.0,
+                "admitted_total": self._admitted_total,
+                "rejected_total": self._rejected_total
+            }
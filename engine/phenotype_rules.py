@@ -44,9 +44,60 @@ PHENOTYPE_ABBREVIATIONS = {
     'High toxicity risk': 'PM'       # Conservative mapping for DPYD
 }
 
+class DetectedVariant:
+    """
+    A parsed variant matched to a VARIANT_PHENOTYPES rule.
+    Holds references to both instead of copying their fields.
+    """
+    __slots__ = ('variant', 'rule')
+
+    def __init__(self, variant, rule):
+        self.variant = variant
+        self.rule = rule
+
+    @property
+    def gene(self):
+        return self.rule['gene']
+
+    @property
+    def phenotype(self):
+        return self.rule['phenotype']
+
+    @property
+    def severity(self):
+        return self.rule['severity']
+
+    @property
+    def rsid(self):
+        return self.variant.rsid
+
+    @property
+    def genotype(self):
+        return self.variant.genotype
+
+    def to_dict(self):
+        return {
+            'gene': self.gene,
+            'phenotype': self.phenotype,
+            'severity': self.severity,
+            'rsid': self.rsid,
+            'genotype': self.genotype
+        }
+
+
+def profile_to_dict(phenotype_profile):
+    """
+    Converts a phenotype profile to plain dicts for JSON output.
+    """
+    return {
+        **phenotype_profile,
+        'detected_variants': [v.to_dict() for v in phenotype_profile.get('detected_variants', [])]
+    }
+
+
 def infer_phenotype(variants, drug_name):
     """
-    Infers phenotype from a list of variants, specific to the drug's target gene.
+    Infers phenotype from a list of Variant records, specific to the drug's target gene.
     Returns abbreviation (PM, IM, NM, RM, URM).
     """
     normalized_drug = drug_name.lower().strip()
@@ -64,22 +115,14 @@ def infer_phenotype(variants, drug_name):
     detected_phenotypes = []
     
     # Filter variants for the specific target gene
-    relevant_variants = [v for v in variants if v.get('gene') == target_gene]
+    relevant_variants = [v for v in variants if v.gene == target_gene]
     
     # Check each relevant variant against our rules
     for variant in relevant_variants:
-        rsid = variant.get('rsid')
-        if rsid in VARIANT_PHENOTYPES:
-            rule = VARIANT_PHENOTYPES[rsid]
-            # Double check gene match just in case
-            if rule['gene'] == target_gene:
-                detected_phenotypes.append({
-                    'gene': rule['gene'],
-                    'phenotype': rule['phenotype'],
-                    'severity': rule['severity'],
-                    'rsid': rsid,
-                    'genotype': variant.get('genotype')
-                })
+        rule = VARIANT_PHENOTYPES.get(variant.rsid)
+        # Double check gene match just in case
+        if rule and rule['gene'] == target_gene:
+            detected_phenotypes.append(DetectedVariant(variant, rule))
             
     if not detected_phenotypes:
         return {
@@ -90,17 +133,17 @@ def infer_phenotype(variants, drug_name):
         }
         
     # Sort by severity (descending)
-    detected_phenotypes.sort(key=lambda x: x['severity'], reverse=True)
+    detected_phenotypes.sort(key=lambda x: x.severity, reverse=True)
     
     # Pick the most severe one as primary
     primary_finding = detected_phenotypes[0]
     
     # Convert to Abbreviation
-    full_phenotype = primary_finding['phenotype']
+    full_phenotype = primary_finding.phenotype
     abbreviation = PHENOTYPE_ABBREVIATIONS.get(full_phenotype, full_phenotype)
     
     return {
-        'primary_gene': primary_finding['gene'],
+        'primary_gene': primary_finding.gene,
         'phenotype': abbreviation,
         'diplotype': '*1/*2', # Simple placeholder
         'detected_variants': detected_phenotypes
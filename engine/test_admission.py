@@ -0,0 +1,93 @@
+import io
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.admission import AdmissionController, AdmissionRejected, estimate_request_cost, count_vcf_samples
+
+def test_admission_control():
+    print("Testing Admission Control...")
+
+    # Case 1: Sample count from #CHROM header (stream position restored)
+    stream = io.BytesIO(b"##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\n")
+    assert count_vcf_samples(stream) == 2
+    assert stream.tell() == 0
+
+    # Case 2: Uncached LLM drugs dominate cost
+    uncached = estimate_request_cost(0, 1, ['codeine', 'warfarin'])
+    cached = estimate_request_cost(0, 1, ['codeine', 'warfarin'], is_cached=lambda d: True)
+    print(f"\nCase 2: uncached = {uncached}, cached = {cached}")
+    assert uncached > cached
+
+    # Case 3: Work beyond the budget is rejected with Retry-After
+    controller = AdmissionController(budget=10, queue_timeout=0.05, retry_after=7)
+    controller.acquire(8)
+    try:
+        controller.acquire(8)
+        assert False, "Expected AdmissionRejected"
+    except AdmissionRejected as e:
+        assert e.retry_after == 7
+    assert controller.snapshot()['rejected_total'] == 1
+
+    # Case 4: Releasing frees the budget
+    controller.release(8)
+    controller.acquire(8)
+    assert controller.snapshot()['in_flight_cost'] == 8
+
+    print("\nSUCCESS: Admission control verified!")
+
+def test_waiting_request_wakes_on_release():
+    print("Testing queue wake-up on release...")
+    controller = AdmissionController(budget=10, queue_timeout=5, retry_after=7)
+    controller.acquire(8)
+
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: (controller.acquire(8), admitted.set()))
+    waiter.start()
+
+    # Waiter is queued behind the in-flight request
+    time.sleep(0.1)
+    assert not admitted.is_set()
+    assert controller.snapshot()['queued_requests'] == 1
+
+    controller.release(8)
+    waiter.join(timeout=2)
+    assert admitted.is_set()
+    assert controller.snapshot()['in_flight_requests'] == 1
+
+def test_queued_large_request_blocks_newer_ones():
+    print("Testing FIFO ordering...")
+    controller = AdmissionController(budget=10, queue_timeout=5, retry_after=7)
+    controller.acquire(4)
+
+    order = []
+    def admit(name, cost):
+        controller.acquire(cost)
+        order.append(name)
+
+    # Over-budget request queues first; a small one that would fit arrives after it
+    large = threading.Thread(target=admit, args=('large', 20))
+    large.start()
+    time.sleep(0.1)
+    small = threading.Thread(target=admit, args=('small', 2))
+    small.start()
+    time.sleep(0.1)
+    assert order == []
+
+    controller.release(4)
+    large.join(timeout=2)
+    time.sleep(0.1)
+    assert order == ['large']
+
+    controller.release(20)
+    small.join(timeout=2)
+    assert order == ['large', 'small']
+
+if __name__ == "__main__":
+    test_admission_control()
+    test_waiting_request_wakes_on_release()
+    test_queued_large_request_blocks_newer_ones()
@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from parser.vcf_parser import parse_vcf, GT_MISSING, GT_INVALID
+from engine.phenotype_rules import infer_phenotype, profile_to_dict
+
+HEADER = "##fileformat=VCFv4.2\n#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\n"
+
+def _parse(lines):
+    with tempfile.NamedTemporaryFile('w', suffix='.vcf', delete=False) as f:
+        f.write(HEADER + ''.join(lines))
+        path = f.name
+    try:
+        return parse_vcf(path)
+    finally:
+        os.remove(path)
+
+def _line(rsid, gene, ref, alt, gt):
+    # Gene/rsID/alleles are built by concatenation so they are not compile-time constants
+    return '\t'.join(['10', '1', rsid, ref, alt, '.', 'PASS', 'GENE=' + gene, 'GT', gt]) + '\n'
+
+def test_genotype_decoding():
+    print("Testing genotype decoding...")
+    variants = _parse([
+        _line('rs4244285', 'CYP2C19', 'G', 'A', '0/1'),
+        _line('rs4244285', 'CYP2C19', 'G', 'A', '1|1'),
+        _line('rs3892097', 'CYP2D6', 'C', 'T,G', '2|.'),
+        _line('rs3892097', 'CYP2D6', 'C', 'T', '0/3'),
+        _line('rs3892097', 'CYP2D6', 'C', 'T', '0/1.5'),
+    ])
+    assert [v.gt for v in variants] == [(0, 1), (1, 1), (2, GT_MISSING), (0, 3), (0, GT_INVALID)]
+    assert [v.genotype for v in variants] == ['G/A', 'A/A', 'G/.', 'C/?', 'C/?']
+
+def test_symbols_interned_and_shared():
+    print("Testing interning...")
+    variants = _parse([
+        _line('rs' + '4244285', 'CYP' + '2C19', 'G', 'A', '0/1'),
+        _line('rs' + '4244285', 'CYP' + '2C19', 'G', 'A', '1/1'),
+    ])
+    first, second = variants
+    assert first.gene is second.gene is sys.intern('CYP2C19')
+    assert first.rsid is second.rsid is sys.intern('rs4244285')
+    # Same REF/ALT pair reuses one allele tuple of interned strings
+    assert first.alleles is second.alleles
+    assert all(a is sys.intern(a) for a in first.alleles)
+    assert not hasattr(first, '__dict__')
+
+def test_profile_matches_dict_output():
+    print("Testing profile_to_dict output...")
+    variants = _parse([
+        _line('rs3892097', 'CYP2D6', 'C', 'T,G', '2|.'),
+        _line('rs4244285', 'CYP2C19', 'G', 'A', '0/1'),
+    ])
+
+    profile = profile_to_dict(infer_phenotype(variants, 'Codeine'))
+    expected = {
+        'primary_gene': 'CYP2D6',
+        'phenotype': 'PM',
+        'diplotype': '*1/*2',
+        'detected_variants': [{
+            'gene': 'CYP2D6',
+            'phenotype': 'Poor Metabolizer',
+            'severity': 4,
+            'rsid': 'rs3892097',
+            'genotype': 'G/.'
+        }]
+    }
+    assert profile == expected
+    # Key order is part of the JSON report
+    assert list(profile) == list(expected)
+    assert list(profile['detected_variants'][0]) == list(expected['detected_variants'][0])
+
+    # No variants for target gene: same dict as before
+    profile = profile_to_dict(infer_phenotype(variants, 'warfarin'))
+    assert profile == {'primary_gene': 'CYP2C9', 'phenotype': 'NM', 'diplotype': '*1/*1', 'detected_variants': []}
+
+if __name__ == "__main__":
+    test_genotype_decoding()
+    test_symbols_interned_and_shared()
+    test_profile_matches_dict_output()
+    print("\nSUCCESS: Variant records verified!")
@@ -15,7 +15,7 @@ def _construct_prompt(phenotype_profile, drug_name, risk_assessment):
     Patient Data:
     - Gene: {phenotype_profile.get('primary_gene')}
     - Phenotype: {phenotype_profile.get('phenotype')}
-    - Detected Variants: {json.dumps(phenotype_profile.get('detected_variants', []))}
+    - Detected Variants: {json.dumps(phenotype_profile.get('detected_variants', []), default=lambda v: v.to_dict())}
     
     Drug: {drug_name}
     Risk Assessment: {risk_assessment.get('risk_label')} ({risk_assessment.get('severity')})
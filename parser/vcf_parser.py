@@ -1,16 +1,92 @@
 import re
+import sys
 
 TARGET_GENES = {
     'CYP2D6', 'CYP2C19', 'CYP2C9', 'SLCO1B1', 'TPMT', 'DPYD'
 }
 
+# Genotype allele index codes
+GT_MISSING = -1  # '.'
+GT_INVALID = -2  # Unparseable index
+
+# Shared caches so repeated REF/ALT and GT values reuse one tuple
+_CACHE_LIMIT = 10000
+_ALLELES_CACHE = {}
+_GT_CACHE = {}
+
+
+class Variant:
+    """
+    Compact variant record. Gene, rsID and alleles are interned strings;
+    the genotype is a tuple of allele indices into `alleles` (REF first).
+    """
+    __slots__ = ('gene', 'rsid', 'alleles', 'gt')
+
+    def __init__(self, gene, rsid, alleles, gt):
+        self.gene = gene
+        self.rsid = rsid
+        self.alleles = alleles
+        self.gt = gt
+
+    @property
+    def genotype(self):
+        """Genotype as allele bases, e.g. 'A/G'."""
+        mapped_alleles = []
+        for idx in self.gt:
+            if idx == GT_MISSING:
+                mapped_alleles.append('.')
+            elif 0 <= idx < len(self.alleles):
+                mapped_alleles.append(self.alleles[idx])
+            else:
+                mapped_alleles.append('?')
+        return '/'.join(mapped_alleles)
+
+    def to_dict(self):
+        return {
+            "gene": self.gene,
+            "rsid": self.rsid,
+            "genotype": self.genotype
+        }
+
+    def __repr__(self):
+        return f"Variant({self.gene}, {self.rsid}, {self.genotype})"
+
+
+def _encode_alleles(ref, alt):
+    key = (ref, alt)
+    alleles = _ALLELES_CACHE.get(key)
+    if alleles is None:
+        alleles = tuple(sys.intern(a) for a in [ref] + alt.split(','))
+        if len(_ALLELES_CACHE) < _CACHE_LIMIT:
+            _ALLELES_CACHE[key] = alleles
+    return alleles
+
+
+def _encode_gt(gt_val):
+    gt = _GT_CACHE.get(gt_val)
+    if gt is None:
+        # Regex to find numbers in GT string (handles / and |)
+        indices = []
+        for idx_str in re.findall(r'([0-9.]+)', gt_val):
+            if idx_str == '.':
+                indices.append(GT_MISSING)
+            else:
+                try:
+                    indices.append(int(idx_str))
+                except ValueError:
+                    indices.append(GT_INVALID)
+        gt = tuple(indices)
+        if len(_GT_CACHE) < _CACHE_LIMIT:
+            _GT_CACHE[gt_val] = gt
+    return gt
+
 
 def parse_vcf(file_path):
     """
     Parses a VCF file and extracts variants for target genes.
     
     Returns:
-        List of dictionaries: [ { "gene": "...", "rsid": "...", "genotype": "..." } ]
+        List of Variant records (use Variant.to_dict() for JSON output)
     """
     variants = []
     print(f"DEBUG: Parsing {file_path}")
@@ -92,36 +168,12 @@ def parse_vcf(file_path):
                 gt_val = sample_parts[gt_idx]
                 
                 # Parse genotype like 0/1, 0|1, 1/1
-                # We need to map 0->REF, 1->ALT1, 2->ALT2...
-                
-                alleles = [ref] + alt.split(',')
-                
-                # Regex to find numbers in GT string (handles / and |)
-                gt_indices = re.findall(r'([0-9.]+)', gt_val)
-                
-                mapped_alleles = []
-                for idx_str in gt_indices:
-                    if idx_str == '.':
-                        mapped_alleles.append('.') # Missing
-                    else:
-                        try:
-                            idx = int(idx_str)
-                            if 0 <= idx < len(alleles):
-                                mapped_alleles.append(alleles[idx])
-                            else:
-                                mapped_alleles.append('?') # Invalid index
-                        except ValueError:
-                            mapped_alleles.append('?')
-                            
-                genotype_str = '/'.join(mapped_alleles)
+                # Stored as allele indices: 0->REF, 1->ALT1, 2->ALT2...
+                variant = Variant(sys.intern(gene), sys.intern(rsid), _encode_alleles(ref, alt), _encode_gt(gt_val))
                 
-                print(f"DEBUG: Extracted {gene} {rsid} {genotype_str}")
+                print(f"DEBUG: Extracted {variant.gene} {variant.rsid} {variant.gt}")
 
-                variants.append({
-                    "gene": gene,
-                    "rsid": rsid,
-                    "genotype": genotype_str
-                })
+                variants.append(variant)
                 
     except Exception as e:
         print(f"Error parsing VCF: {e}")
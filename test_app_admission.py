@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import app as pharmaguard_app
+from engine.admission import AdmissionController
+
+VCF = (
+    b"##fileformat=VCFv4.2\n"
+    b"#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\n"
+    b"10\t94781859\trs4244285\tG\tA\t.\tPASS\tGENE=CYP2C19\tGT\t0/1\n"
+)
+
+def _post(client, data=VCF):
+    return client.post('/analyze', data={
+        'file': (io.BytesIO(data), 'patient.vcf'),
+        'drug': 'clopidogrel'
+    }, content_type='multipart/form-data')
+
+def _with_controller(controller):
+    original = pharmaguard_app.admission
+    pharmaguard_app.admission = controller
+    return original
+
+def test_analyze_returns_503_with_retry_after():
+    print("Testing 503 + Retry-After...")
+    original = _with_controller(AdmissionController(budget=1, queue_timeout=0.05, retry_after=7))
+    try:
+        # Occupy the budget with another in-flight request
+        pharmaguard_app.admission.acquire(1)
+        response = _post(pharmaguard_app.app.test_client())
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '7'
+        assert pharmaguard_app.admission.snapshot()['rejected_total'] == 1
+
+        metrics = pharmaguard_app.app.test_client().get('/metrics').get_json()
+        assert metrics['admission']['in_flight_requests'] == 1
+    finally:
+        pharmaguard_app.admission = original
+
+def test_analyze_releases_budget_on_parse_error():
+    print("Testing release on parse error...")
+    original = _with_controller(AdmissionController(budget=100))
+    try:
+        response = _post(pharmaguard_app.app.test_client(), data=b"#CHROM\n")
+        assert response.status_code == 302
+        snapshot = pharmaguard_app.admission.snapshot()
+        assert snapshot['admitted_total'] == 1
+        assert snapshot['in_flight_requests'] == 0
+        assert snapshot['in_flight_cost'] == 0
+    finally:
+        pharmaguard_app.admission = original
+
+def test_analyze_releases_budget_on_exception():
+    print("Testing release on pipeline exception...")
+    original = _with_controller(AdmissionController(budget=100))
+    original_infer = pharmaguard_app.infer_phenotype
+
+    def failing_infer(variants, drug_name):
+        raise RuntimeError("boom")
+
+    pharmaguard_app.infer_phenotype = failing_infer
+    try:
+        response = _post(pharmaguard_app.app.test_client())
+        assert response.status_code == 302
+        snapshot = pharmaguard_app.admission.snapshot()
+        assert snapshot['admitted_total'] == 1
+        assert snapshot['in_flight_requests'] == 0
+        assert snapshot['in_flight_cost'] == 0
+    finally:
+        pharmaguard_app.infer_phenotype = original_infer
+        pharmaguard_app.admission = original
+
+if __name__ == "__main__":
+    test_analyze_returns_503_with_retry_after()
+    test_analyze_releases_budget_on_parse_error()
+    test_analyze_releases_budget_on_exception()
+    print("\nSUCCESS: /analyze admission control verified!")